@@ -1,12 +1,49 @@
+import bisect
+import functools
+import hashlib
+import html
 import json
 import os
+import socket
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from urllib.parse import quote_plus
 
 import requests
 import streamlit as st
 from openai import OpenAI
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson(pip install orjson)은 선택 사항이며 없으면 표준 json을 사용
+    from json import loads as _json_loads
+
+try:
+    from pybloom_live import BloomFilter
+except ImportError:  # 블룸 필터(pip install pybloom_live)도 선택 사항이며 없으면 모든 노래를 YouTube에서 검증
+    BloomFilter = None
+
+
+_BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+# 인터넷 연결 확인 결과를 재사용하는 시간(초)
+_NET_CHECK_TTL = 30
+
+# 같은 호스트(www.youtube.com)에 대한 TCP/TLS 연결을 재사용하기 위한 공용 세션
+_HTTP = requests.Session()
+_HTTP.headers.update(_BROWSER_HEADERS)
+_HTTP.mount(
+    "https://",
+    HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=Retry(total=1, backoff_factor=0.2)),
+)
 
 
 @dataclass
@@ -18,13 +55,21 @@ class SongRecommendation:
     highlight: str
 
 
-def check_internet_connection(test_url: str = "https://www.google.com", timeout: int = 5) -> bool:
-    """Return True when an HTTP GET to test_url completes successfully within timeout."""
+def check_internet_connection(host: str = "8.8.8.8", port: int = 443, timeout: int = 2) -> bool:
+    """Return True when a TCP connection to host:port can be opened within timeout."""
+
+    # 최근에 연결을 확인했다면 Streamlit 재실행마다 다시 확인하지 않음
+    checked_at = st.session_state.get("_net_ok")
+    if checked_at is not None and time.monotonic() - checked_at < _NET_CHECK_TTL:
+        return True
 
     try:
-        requests.get(test_url, timeout=timeout)
-    except requests.RequestException:
+        socket.create_connection((host, port), timeout=timeout).close()
+    except OSError:
         return False
+
+    # 연결에 성공한 경우만 기록 (실패하면 "다시 시도" 시 바로 재확인)
+    st.session_state["_net_ok"] = time.monotonic()
     return True
 
 
@@ -40,33 +85,34 @@ def get_openai_client(api_key: str) -> Optional[OpenAI]:
         return None
 
 
+# 기분 수준의 구간 경계: 1 이하, 3 이하, 5 이하, 7 이하, 그 이상
+_MOOD_THRESHOLDS = (1, 3, 5, 7)
+
+_MOOD_DESCRIPTIONS = (
+    "매우 우울한",
+    "조금 우울한",
+    "보통의",
+    "조금 신나는",
+    "매우 신나는",
+)
+
+_MOOD_INSTRUCTIONS = (
+    "사용자의 기분이 매우 우울하므로, 위로와 공감을 주는 감성적인 노래를 추천하세요.",
+    "사용자의 기분이 조금 우울하므로, 위로와 힐링을 주는 노래를 추천하세요.",
+    "사용자의 기분이 보통이므로, 테마에 맞는 평온한 노래를 추천하세요.",
+    "사용자의 기분이 좋으므로, 경쾌하고 신나는 노래를 추천하세요.",
+    "사용자의 기분이 매우 좋으므로, 매우 경쾌하고 에너지 넘치는 노래를 추천하세요.",
+)
+
+
+@functools.lru_cache(maxsize=128)
 def build_prompt(mood_level: int, genre: str, theme: str) -> str:
     """Compose a system prompt for the GPT API to request song recommendations."""
 
-    mood_description = (
-        "매우 우울한"
-        if mood_level <= 1
-        else "조금 우울한"
-        if mood_level <= 3
-        else "보통의"
-        if mood_level <= 5
-        else "조금 신나는"
-        if mood_level <= 7
-        else "매우 신나는"
-    )
+    mood_index = bisect.bisect_left(_MOOD_THRESHOLDS, mood_level)
+    mood_description = _MOOD_DESCRIPTIONS[mood_index]
+    mood_instruction = _MOOD_INSTRUCTIONS[mood_index]
 
-    mood_instruction = (
-        "사용자의 기분이 매우 우울하므로, 위로와 공감을 주는 감성적인 노래를 추천하세요."
-        if mood_level <= 1
-        else "사용자의 기분이 조금 우울하므로, 위로와 힐링을 주는 노래를 추천하세요."
-        if mood_level <= 3
-        else "사용자의 기분이 보통이므로, 테마에 맞는 평온한 노래를 추천하세요."
-        if mood_level <= 5
-        else "사용자의 기분이 좋으므로, 경쾌하고 신나는 노래를 추천하세요."
-        if mood_level <= 7
-        else "사용자의 기분이 매우 좋으므로, 매우 경쾌하고 에너지 넘치는 노래를 추천하세요."
-    )
-    
     return (
         "당신은 음악 큐레이터입니다."
         " 사용자에게 아래 조건에 맞는 노래 5곡을 추천하세요."
@@ -90,156 +136,456 @@ def build_prompt(mood_level: int, genre: str, theme: str) -> str:
     )
 
 
-def verify_song_exists(title: str, artist: str) -> bool:
-    """Check if a song exists on YouTube and verify that the title and artist match."""
-    try:
-        # 정확한 매칭을 위해 제목과 아티스트로 검색
-        search_query = f"{title} {artist}"
-        encoded_query = quote_plus(search_query)
-        search_url = f"https://www.youtube.com/results?search_query={encoded_query}"
-        
-        # YouTube 검색 페이지에 요청
-        response = requests.get(search_url, timeout=5, headers={
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-        
-        if response.status_code == 200:
-            content = response.text.lower()
-            title_lower = title.lower().strip()
-            artist_lower = artist.lower().strip()
-            
-            # 제목과 아티스트가 모두 검색 결과에 나타나는지 확인
-            title_found = title_lower in content
-            artist_found = artist_lower in content
-            
-            # 제목과 아티스트가 모두 있어야 함
-            if title_found and artist_found:
-                # 더 정확한 검증: 제목과 아티스트가 가까이 있는지 확인
-                # YouTube 검색 결과에서 보통 제목과 아티스트가 함께 나타남
-                # 간단한 검증: 제목과 아티스트가 모두 존재하는지만 확인
-                return True
-            
-            # 제목만 있거나 아티스트만 있으면 매칭 실패로 간주
+class _SongMatcher:
+    """Check a raw search results page, fed in chunks, for the title and the artist appearing together."""
+
+    # YouTube 검색 결과에서 보통 "제목 - 아티스트" 형식으로 나타남
+    _SEPARATOR = b" - "
+    # 제목과 아티스트가 처음 나타난 위치가 이 거리(바이트) 이내면 매칭된 것으로 간주
+    _NEARBY = 500
+
+    def __init__(self, title: str, artist: str) -> None:
+        self._title = title.strip().encode().lower()
+        self._artist = artist.strip().encode().lower()
+        self._body = bytearray()
+        self._title_starts: set = set()
+        self._artist_starts: set = set()
+        self._first_title: Optional[int] = None
+        self._first_artist: Optional[int] = None
+        self._title_next = 0
+        self._artist_next = 0
+        self._matched = False
+
+    def _scan(self, needle: bytes, start: int) -> Tuple[List[int], int]:
+        """Return the new offsets of needle from start on, and the offset to resume from after the next chunk."""
+        starts = []
+        found = self._body.find(needle, start)
+        while found != -1:
+            starts.append(found)
+            found = self._body.find(needle, found + 1)
+        # 다음 조각에서는 경계에 걸친 부분(needle 길이 - 1)만 다시 확인
+        return starts, max(start, len(self._body) - len(needle) + 1)
+
+    def _joined(self, first_start: int, first: bytes, second_starts: set) -> bool:
+        """Return True when a "first - second" pair starts at first_start."""
+        end = first_start + len(first)
+        return (
+            end + len(self._SEPARATOR) in second_starts
+            and self._body[end:end + len(self._SEPARATOR)] == self._SEPARATOR
+        )
+
+    def feed(self, chunk: bytes) -> bool:
+        """Consume the next part of the page and return True once the song has been matched."""
+        if self._matched:
+            return True
+
+        # 대소문자 구분 없이 비교하기 위해 새 조각만 소문자로 변환 (ASCII만 변환됨)
+        self._body += chunk.lower()
+
+        # 제목과 아티스트의 시작 위치를 따로 찾으므로
+        # 한쪽이 다른 쪽의 접두어여도(예: Red / Red Velvet) 같은 위치가 둘 다 기록됨
+        new_titles, self._title_next = self._scan(self._title, self._title_next)
+        new_artists, self._artist_next = self._scan(self._artist, self._artist_next)
+        self._title_starts.update(new_titles)
+        self._artist_starts.update(new_artists)
+        if self._first_title is None and new_titles:
+            self._first_title = new_titles[0]
+        if self._first_artist is None and new_artists:
+            self._first_artist = new_artists[0]
+
+        # 제목과 아티스트가 모두 검색 결과에 나타나야 함
+        if self._first_title is None or self._first_artist is None:
             return False
-        
-        return False
+
+        # 새로 찾은 위치가 "제목 - 아티스트" 또는 "아티스트 - 제목"의 앞쪽이나 뒤쪽인지 확인
+        separator_len = len(self._SEPARATOR)
+        for start in new_titles:
+            previous = start - separator_len - len(self._artist)
+            if self._joined(start, self._title, self._artist_starts) or (
+                previous in self._artist_starts and self._joined(previous, self._artist, self._title_starts)
+            ):
+                self._matched = True
+        for start in new_artists:
+            previous = start - separator_len - len(self._title)
+            if self._joined(start, self._artist, self._title_starts) or (
+                previous in self._title_starts and self._joined(previous, self._title, self._artist_starts)
+            ):
+                self._matched = True
+
+        # 또는 제목과 아티스트가 가까이 있는지 확인
+        if abs(self._first_title - self._first_artist) < self._NEARBY:
+            self._matched = True
+        return self._matched
+
+
+def _page_matches_song(body: bytes, title: str, artist: str) -> bool:
+    """Return True when the title and the artist appear together in a raw search results page."""
+    return _SongMatcher(title, artist).feed(body)
+
+
+# 세션별로 보관하는 추천 결과 개수 (기분, 장르, 테마 조합 기준)
+_REC_CACHE_SIZE = 32
+
+# 유명 곡 블룸 필터 파일 (기본으로 제공되지 않으며, 있으면 해당 곡은 검증을 건너뜀)
+_KNOWN_SONGS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "known_songs.bloom")
+
+# YOUTUBE_API_KEY 환경 변수가 있으면 검색 결과 페이지 대신 사용하는 YouTube Data API
+_YOUTUBE_API_URL = "https://www.googleapis.com/youtube/v3/search"
+
+# 검색 결과 페이지는 앞부분에 결과 목록이 있으므로 최대 512KB까지만 나눠서 읽음
+_PAGE_CHUNK_SIZE = 64 * 1024
+_PAGE_MAX_BYTES = 512 * 1024
+
+# 일찍 멈춘 뒤 남은 본문이 이 크기 이하이면 마저 읽어서 연결을 풀에 돌려줌
+_PAGE_DRAIN_BYTES = 128 * 1024
+
+# 노래 검증을 동시에 실행하는 최대 스레드 수
+_VERIFY_WORKERS = 10
+
+# (제목, 아티스트) -> 검증 결과. 검증 스레드들이 함께 사용하는 LRU 캐시
+_VERIFY_CACHE_SIZE = 512
+_verify_cache: "OrderedDict[Tuple[str, str], bool]" = OrderedDict()
+_verify_cache_lock = threading.Lock()
+
+
+def _normalize_song(title: str, artist: str) -> Tuple[str, str]:
+    """Normalize a (title, artist) pair so equivalent songs share one cache entry."""
+    return title.strip().lower(), artist.strip().lower()
+
+
+def _cached_verdict(key: Tuple[str, str]) -> Optional[bool]:
+    """Return a previously stored verification result, or None when the key is unknown."""
+    with _verify_cache_lock:
+        if key not in _verify_cache:
+            return None
+        _verify_cache.move_to_end(key)
+        return _verify_cache[key]
+
+
+def _store_verdict(key: Tuple[str, str], verdict: bool) -> None:
+    """Store a verification result, evicting the least recently used entry when full."""
+    with _verify_cache_lock:
+        _verify_cache[key] = verdict
+        _verify_cache.move_to_end(key)
+        if len(_verify_cache) > _VERIFY_CACHE_SIZE:
+            _verify_cache.popitem(last=False)
+
+
+def _search_page_matches(title: str, feed: Callable[[bytes], bool]) -> Optional[bool]:
+    """
+    Search YouTube for the title, pass each received chunk of the raw results page to feed,
+    and return its last result, or None on a non-200 response.
+    Reading stops as soon as feed(chunk) is true or _PAGE_MAX_BYTES have been received.
+    """
+    # 제목만으로 검색: 검색어는 결과 페이지에 그대로 다시 나타나므로(<title> 등),
+    # 아티스트까지 검색어에 넣으면 실제 결과와 상관없이 항상 매칭됨
+    search_url = f"https://www.youtube.com/results?search_query={quote_plus(title)}"
+
+    # YouTube 검색 페이지에 요청하고, 필요한 부분까지만 읽음
+    with _HTTP.get(search_url, timeout=5, stream=True) as response:
+        if response.status_code != 200:
+            return None
+        received = 0
+        matched = False
+        chunks = response.iter_content(_PAGE_CHUNK_SIZE)
+        for chunk in chunks:
+            received += len(chunk)
+            # 새로 받은 조각만 넘기고, 마지막 판정을 그대로 반환하므로 다시 스캔하지 않음
+            matched = feed(chunk)
+            if matched or received >= _PAGE_MAX_BYTES:
+                break
+        else:
+            return matched
+
+        # 본문을 끝까지 읽지 않고 닫으면 연결이 풀로 돌아가지 않고 끊어짐.
+        # 남은 양이 적을 때만 마저 읽어 연결을 재사용하고, 많으면 재연결 비용을 감수함
+        remaining = int(response.headers.get("Content-Length", -1)) - response.raw.tell()
+        if 0 <= remaining <= _PAGE_DRAIN_BYTES:
+            for _ in chunks:
+                pass
+    return matched
+
+
+def _api_items_match(data: dict, title: str, artist: str) -> bool:
+    """Return True when any video in a YouTube Data API search.list response matches the song."""
+    for item in data.get("items", []):
+        snippet = item.get("snippet", {})
+        # 영상 제목과 채널명을 합쳐 검색 결과 페이지와 같은 방식으로 확인
+        text = html.unescape(f"{snippet.get('title', '')}\n{snippet.get('channelTitle', '')}")
+        if _page_matches_song(text.encode(), title, artist):
+            return True
+    return False
+
+
+def _api_search_params(title: str, artist: str, api_key: str) -> dict:
+    """Build the search.list query parameters for a (title, artist) pair."""
+    return {
+        "part": "snippet",
+        "q": f"{title} {artist}",
+        "maxResults": 5,
+        "type": "video",
+        "key": api_key,
+    }
+
+
+def _search_api(title: str, artist: str) -> Optional[bool]:
+    """
+    Verify the song through the YouTube Data API.
+    Returns None when no API key is configured or the API is unavailable (e.g. quota exceeded).
+    """
+    api_key = os.environ.get("YOUTUBE_API_KEY", "").strip()
+    if not api_key:
+        return None
+
+    response = _HTTP.get(
+        _YOUTUBE_API_URL, params=_api_search_params(title, artist, api_key), timeout=5
+    )
+    if response.status_code != 200:
+        return None
+    return _api_items_match(_json_loads(response.content), title, artist)
+
+
+def _known_song_key(title: str, artist: str) -> str:
+    """Return the key under which a song is stored in the known-songs bloom filter."""
+    return "\t".join(_normalize_song(title, artist))
+
+
+@st.cache_resource
+def load_known_songs(path: str = _KNOWN_SONGS_PATH) -> Optional["BloomFilter"]:
+    """
+    Load the bloom filter of well-known songs, or None when pybloom_live or the file is missing.
+    No filter ships with the app. To use one, install pybloom_live and place at path a BloomFilter
+    filled with _known_song_key(title, artist) entries and written with BloomFilter.tofile.
+    The result, including None, is cached for the life of the process, so a file added later
+    is only picked up after a restart.
+    """
+    if BloomFilter is None or not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, "rb") as bloom_file:
+            return BloomFilter.fromfile(bloom_file)
     except Exception:
-        # 검증 실패 시 일단 True 반환 (네트워크 문제 등)
-        return True
+        return None
 
 
-def verify_song_artist_match(title: str, artist: str) -> Tuple[bool, str]:
+def verify_song(title: str, artist: str) -> Tuple[bool, str]:
     """
-    Verify that the song title and artist are correctly matched.
+    Verify with a single YouTube search by title that the song exists and that the title and artist match.
     Returns (is_valid, corrected_artist) tuple.
     """
+    key = _normalize_song(title, artist)
+    cached = _cached_verdict(key)
+    if cached is not None:
+        return (cached, artist)
+
     try:
-        # 제목만으로 검색해서 실제 아티스트 확인
-        title_query = quote_plus(title)
-        search_url = f"https://www.youtube.com/results?search_query={title_query}"
-        
-        response = requests.get(search_url, timeout=5, headers={
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-        
-        if response.status_code == 200:
-            content = response.text.lower()
-            title_lower = title.lower().strip()
-            artist_lower = artist.lower().strip()
-            
-            # 제목이 검색 결과에 있는지 확인
-            if title_lower in content:
-                # 아티스트도 검색 결과에 있는지 확인
-                if artist_lower in content:
-                    # 제목과 아티스트가 함께 나타나는지 확인
-                    # YouTube 검색 결과에서 보통 "제목 - 아티스트" 형식으로 나타남
-                    combined_pattern = f"{title_lower} - {artist_lower}"
-                    if combined_pattern in content or f"{artist_lower} - {title_lower}" in content:
-                        return (True, artist)
-                    # 또는 제목과 아티스트가 가까이 있는지 확인
-                    title_pos = content.find(title_lower)
-                    artist_pos = content.find(artist_lower)
-                    if title_pos != -1 and artist_pos != -1:
-                        # 제목과 아티스트가 500자 이내에 있으면 매칭된 것으로 간주
-                        if abs(title_pos - artist_pos) < 500:
-                            return (True, artist)
-            
-            # 매칭 실패
-            return (False, artist)
-        
-        return (True, artist)  # 검증 실패 시 일단 통과
+        # YouTube Data API를 먼저 사용하고, 쓸 수 없으면 검색 결과 페이지로 확인
+        verdict = _search_api(*key)
+        if verdict is None:
+            # 제목만으로 검색해서 실제 결과에 아티스트가 함께 나타나는지 확인
+            verdict = _search_page_matches(title, _SongMatcher(*key).feed)
+            if verdict is None:
+                return (False, artist)
     except Exception:
-        return (True, artist)  # 검증 실패 시 일단 통과
+        # 검증 실패 시 일단 통과 (네트워크 문제 등), 캐시하지 않음
+        return (True, artist)
+
+    _store_verdict(key, verdict)
+    return (verdict, artist)
+
+
+def _song_fields(item: object) -> Optional[Tuple[str, str]]:
+    """Return the (title, artist) of one item of the GPT response, or None when it cannot be used."""
+    if not isinstance(item, dict):
+        return None
+
+    title = item.get("title", "제목 미상")
+    artist = item.get("artist", "아티스트 미상")
+
+    # 제목이나 아티스트가 기본값이면 건너뛰기
+    if not isinstance(title, str) or not isinstance(artist, str):
+        return None
+    if title == "제목 미상" or artist == "아티스트 미상":
+        return None
+    return title, artist
+
+
+class _SongObjectStream:
+    """Pick complete song objects out of a streamed {"songs": [{...}, ...]} JSON text."""
+
+    def __init__(self) -> None:
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._current: List[str] = []
+
+    def feed(self, text: str) -> List[dict]:
+        """Consume the next piece of text and return the song objects completed by it."""
+        songs = []
+        for char in text:
+            # 최상위 객체 안의 객체(노래 하나)에 속한 문자만 모음
+            if self._depth >= 2:
+                self._current.append(char)
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+                if self._depth == 2:
+                    self._current = [char]
+            elif char == "}":
+                if self._depth == 2:
+                    try:
+                        songs.append(_json_loads("".join(self._current)))
+                    except ValueError:
+                        pass  # 전체 응답을 다시 해석할 때 처리
+                self._depth -= 1
+        return songs
+
+
+def _build_song(item: dict, title: str, artist: str) -> SongRecommendation:
+    """Create a SongRecommendation from one verified item of the GPT response."""
+    return SongRecommendation(
+        title=title,
+        artist=artist,
+        theme=item.get("theme_match", item.get("theme", "")),
+        link=item.get("link", ""),
+        highlight=item.get("key_lyrics", item.get("highlight", "")),
+    )
 
 
 def request_recommendations(
-    client: OpenAI, mood_level: int, genre: str, theme: str
+    client: OpenAI,
+    mood_level: int,
+    genre: str,
+    theme: str,
+    on_song: Optional[Callable[[SongRecommendation], None]] = None,
 ) -> List[SongRecommendation]:
-    """Call the GPT API and parse the response into SongRecommendation items."""
+    """
+    Call the GPT API and parse the response into SongRecommendation items.
+    If on_song is given, it is called with each song as soon as that song is verified.
+    """
+
+    # 같은 조건으로 다시 요청하면 세션에 저장된 결과를 그대로 사용
+    cache_key = hashlib.sha256(f"{mood_level}|{genre}|{theme}".encode()).hexdigest()
+    cache = st.session_state.setdefault("_rec_cache", OrderedDict())
+    if cache_key in cache:
+        cache.move_to_end(cache_key)
+        if on_song is not None:
+            for song in cache[cache_key]:
+                on_song(song)
+        return cache[cache_key]
 
     prompt = build_prompt(mood_level, genre, theme)
+    known_songs = load_known_songs()
 
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": "You are a helpful music recommendation assistant."},
-            {"role": "user", "content": prompt},
-        ],
-        response_format={"type": "json_object"},
-    )
+    # 응답이 생성되는 동안 먼저 완성된 노래부터 검증을 시작
+    executor = ThreadPoolExecutor(max_workers=_VERIFY_WORKERS)
+    futures: Dict[Tuple[str, str], "Future[Tuple[bool, str]]"] = {}
 
-    content = response.choices[0].message.content
-    
-    # JSON 코드 블록이 있으면 추출
-    if "```json" in content:
-        content = content.split("```json")[1].split("```")[0].strip()
-    elif "```" in content:
-        content = content.split("```")[1].split("```")[0].strip()
+    def start_verification(title: str, artist: str) -> None:
+        if (title, artist) in futures:
+            return
+        # 이미 알려진 유명 곡은 검증 없이 통과
+        if known_songs is not None and _known_song_key(title, artist) in known_songs:
+            return
+        futures[(title, artist)] = executor.submit(verify_song, title, artist)
 
     try:
-        payload = json.loads(content)
-    except json.JSONDecodeError as exc:
-        raise ValueError(f"AI 응답을 JSON으로 해석할 수 없습니다: {str(exc)}") from exc
-
-    songs = []
-    
-    # songs 필드가 있는 경우
-    if "songs" in payload and isinstance(payload["songs"], list):
-        items = payload["songs"]
-    # payload 자체가 리스트인 경우
-    elif isinstance(payload, list):
-        items = payload
-    else:
-        raise ValueError("응답에서 노래 목록을 찾을 수 없습니다. JSON 형식을 확인해주세요.")
+        stream = client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": "You are a helpful music recommendation assistant."},
+                {"role": "user", "content": prompt},
+            ],
+            response_format={"type": "json_object"},
+            stream=True,
+        )
 
-    verified_songs = []
-    
-    for item in items:
-        if not isinstance(item, dict):
-            continue
-        
-        title = item.get("title", "제목 미상")
-        artist = item.get("artist", "아티스트 미상")
+        parts = []
+        song_stream = _SongObjectStream()
+        for chunk in stream:
+            if not chunk.choices or not chunk.choices[0].delta.content:
+                continue
+            delta = chunk.choices[0].delta.content
+            parts.append(delta)
+            for item in song_stream.feed(delta):
+                fields = _song_fields(item)
+                if fields is not None:
+                    start_verification(*fields)
+
+        content = "".join(parts)
         
-        # 제목이나 아티스트가 기본값이면 건너뛰기
-        if title == "제목 미상" or artist == "아티스트 미상":
-            continue
+        # JSON 코드 블록이 있으면 추출
+        if "```json" in content:
+            content = content.split("```json")[1].split("```")[0].strip()
+        elif "```" in content:
+            content = content.split("```")[1].split("```")[0].strip()
+
+        try:
+            payload = _json_loads(content)
+        except json.JSONDecodeError as exc:  # orjson.JSONDecodeError도 이 클래스를 상속
+            raise ValueError(f"AI 응답을 JSON으로 해석할 수 없습니다: {str(exc)}") from exc
+
+        # songs 필드가 있는 경우
+        if "songs" in payload and isinstance(payload["songs"], list):
+            items = payload["songs"]
+        # payload 자체가 리스트인 경우
+        elif isinstance(payload, list):
+            items = payload
+        else:
+            raise ValueError("응답에서 노래 목록을 찾을 수 없습니다. JSON 형식을 확인해주세요.")
+
+        candidates = []
         
-        # 노래가 실제로 존재하는지 확인
-        if verify_song_exists(title, artist):
-            # 가수와 노래가 제대로 매칭되는지 추가 검증
-            is_valid_match, verified_artist = verify_song_artist_match(title, artist)
-            
-            if is_valid_match:
-                verified_songs.append(
-                    SongRecommendation(
-                        title=title,
-                        artist=verified_artist,  # 검증된 아티스트 사용
-                        theme=item.get("theme_match", item.get("theme", "")),
-                        link=item.get("link", ""),
-                        highlight=item.get("key_lyrics", item.get("highlight", "")),
-                    )
-                )
+        for item in items:
+            fields = _song_fields(item)
+            # 제목이나 아티스트가 없으면 건너뛰기
+            if fields is None:
+                continue
+
+            candidates.append((item, *fields))
+
+        verified: Dict[int, SongRecommendation] = {}
+        waiting: Dict["Future[Tuple[bool, str]]", List[int]] = {}
+        for index, (item, title, artist) in enumerate(candidates):
+            # 스트리밍 중에 시작하지 못한 노래도 여기서 검증 시작
+            start_verification(title, artist)
+            future = futures.get((title, artist))
+            if future is None:
+                verified[index] = _build_song(item, title, artist)
+                if on_song is not None:
+                    on_song(verified[index])
+            else:
+                waiting.setdefault(future, []).append(index)
+
+        # 검증이 끝나는 순서대로 바로 전달
+        for future in as_completed(waiting):
+            ok, verified_artist = future.result()
+            # 노래가 실제로 존재하고 가수와 노래가 제대로 매칭되는 경우만 사용
+            if not ok:
+                continue
+            for index in waiting[future]:
+                item, title, _ = candidates[index]
+                verified[index] = _build_song(item, title, verified_artist)  # 검증된 아티스트 사용
+                if on_song is not None:
+                    on_song(verified[index])
+    finally:
+        # 오류로 중단된 경우 남은 검증을 기다리지 않음
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    # 반환 목록은 AI가 추천한 순서를 유지
+    verified_songs = [verified[index] for index in sorted(verified)]
     
     # 검증된 노래가 3개 미만이면 재시도
     if len(verified_songs) < 3:
@@ -251,6 +597,10 @@ def request_recommendations(
     if not verified_songs:
         raise ValueError("추천 결과를 찾을 수 없습니다. 입력을 다시 확인해 주세요.")
 
+    cache[cache_key] = verified_songs
+    if len(cache) > _REC_CACHE_SIZE:
+        cache.popitem(last=False)
+
     return verified_songs
 
 
@@ -367,17 +717,27 @@ def main() -> None:
             st.warning("가사의 테마를 입력해 주세요.")
             st.stop()
 
+        # 검증이 끝난 노래부터 바로 보여주기 위한 자리
+        status = st.empty()
+        placeholders = [st.empty() for _ in range(5)]
+        shown = []
+
+        def show_song(song: SongRecommendation) -> None:
+            if len(shown) >= len(placeholders):
+                placeholders.append(st.empty())
+            with placeholders[len(shown)].container():
+                render_song_card(song)
+            shown.append(song)
+
         with st.spinner("AI가 노래를 고르는 중입니다..."):
             try:
-                songs = request_recommendations(client, mood_level, genre, theme)
+                request_recommendations(client, mood_level, genre, theme, on_song=show_song)
             except Exception as exc:  # pylint: disable=broad-except
                 st.error(f"추천에 실패했습니다: {exc}")
                 st.button("다시 시도", on_click=st.rerun)
                 st.stop()
 
-        st.success("추천된 노래를 확인해 보세요!")
-        for song in songs:
-            render_song_card(song)
+        status.success("추천된 노래를 확인해 보세요!")
 
     with st.sidebar:
         st.header("도움말")
@@ -0,0 +1,68 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import _SongMatcher, _SongObjectStream, _api_items_match, _page_matches_song  # noqa: E402
+
+
+class PageMatchesSongTest(unittest.TestCase):
+    def test_title_is_prefix_of_artist(self):
+        self.assertTrue(_page_matches_song(b"Red Velvet - Red", "red", "red velvet"))
+        self.assertTrue(_page_matches_song(b"Lovelyz - Love", "love", "lovelyz"))
+
+    def test_artist_is_prefix_of_title(self):
+        self.assertTrue(_page_matches_song(b"Lovelyz - Love", "lovelyz", "love"))
+
+    def test_self_titled(self):
+        self.assertTrue(_page_matches_song(b"Weezer - Weezer (Blue Album)", "weezer", "weezer"))
+
+    def test_adjacent_far_from_first_occurrence(self):
+        body = b"Hype Boy" + b"x" * 1000 + b"Hype Boy - NewJeans"
+        self.assertTrue(_page_matches_song(body, "hype boy", "newjeans"))
+
+    def test_far_apart_without_separator(self):
+        body = b"Hype Boy" + b"x" * 1000 + b"NewJeans"
+        self.assertFalse(_page_matches_song(body, "hype boy", "newjeans"))
+
+    def test_missing_artist(self):
+        self.assertFalse(_page_matches_song(b"Hype Boy - Someone Else", "hype boy", "newjeans"))
+
+    def test_api_items_match_prefix(self):
+        data = {"items": [{"snippet": {"title": "Red Velvet - Red", "channelTitle": "SMTOWN"}}]}
+        self.assertTrue(_api_items_match(data, "red", "red velvet"))
+
+
+class SongMatcherTest(unittest.TestCase):
+    def test_match_split_across_chunks(self):
+        matcher = _SongMatcher("hype boy", "newjeans")
+        body = b"x" * 1000 + b"Hype Boy - NewJeans"
+        self.assertFalse(matcher.feed(body[:1005]))
+        self.assertFalse(matcher.feed(body[1005:1012]))
+        self.assertTrue(matcher.feed(body[1012:]))
+
+    def test_artist_before_title_in_later_chunk(self):
+        matcher = _SongMatcher("love", "lovelyz")
+        self.assertFalse(matcher.feed(b"Love" + b"x" * 1000))
+        self.assertTrue(matcher.feed(b"Lovelyz - Love"))
+
+
+class SongObjectStreamTest(unittest.TestCase):
+    def test_songs_split_across_chunks(self):
+        text = '{"songs": [{"title": "A {b}", "artist": "C \\"D\\""}, {"title": "E", "artist": "F"}]}'
+        stream = _SongObjectStream()
+        songs = []
+        for index in range(0, len(text), 7):
+            songs.extend(stream.feed(text[index:index + 7]))
+        self.assertEqual(
+            songs,
+            [{"title": "A {b}", "artist": 'C "D"'}, {"title": "E", "artist": "F"}],
+        )
+
+    def test_incomplete_song_is_not_returned(self):
+        self.assertEqual(_SongObjectStream().feed('{"songs": [{"title": "A"'), [])
+
+
+if __name__ == "__main__":
+    unittest.main()